@@ -5,33 +5,152 @@ detected on Bus 002 Port 001 only, otherwise print 0.
 When detected, mounts the drive and validates signature.
 """
 
+import ctypes
+import errno
+import hashlib
 import os
+import re
+import signal
 import sys
+import threading
 import time
-import subprocess
-import tempfile
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa, utils
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from cryptography.hazmat.backends import default_backend
 from cryptography.exceptions import InvalidSignature
 
+try:
+    import pyudev
+except ImportError:
+    # Without pyudev we fall back to rescanning /sys/block every second
+    pyudev = None
+
 # Bus 002 Port 001 = sysfs port "2-1". Override with env USB_FLASH_PORT if needed.
 USB_PORT = os.environ.get("USB_FLASH_PORT", "2-1")
 
+# Nice level to run at so ticks stay on time under load; empty to disable.
+# Only ever raises priority, so a lower Nice= from systemd is kept.
+USB_MON_NICE = os.environ.get("USB_MON_NICE", "-5")
+
+# Prefixes of ports behind USB_PORT (hub ports "2-1.3", interfaces "2-1:1.0")
+_PORT_PREFIXES = (USB_PORT + ".", USB_PORT + ":")
+
+# Port ("1-1", "1-1.2", "2-1", ...) following the usbN root hub in a sysfs path
+_USB_PORT_RE = re.compile(r"/usb\d+/(\d+-[\d.]+)(?=/|$)")
+
 # Public key for validation (replace with actual public key)
 PUBLIC_KEY_PEM = b"""-----BEGIN PUBLIC KEY-----
 REPLACE_THIS_WITH_YOUR_PUBLIC_KEY_CONTENT
 -----END PUBLIC KEY-----"""
 
+# mount(2) / umount2(2) flags from <sys/mount.h>
+MS_RDONLY = 1
+MS_NOSUID = 2
+MS_NODEV = 4
+MS_NOEXEC = 8
+MS_SILENT = 32768
+MNT_DETACH = 2
+
+# Single mount point reused for every drive; created by main() at startup
+MOUNT_POINT = "/run/usb-validator/mnt"
+
+# Filesystems tried first when mounting, before the rest of /proc/filesystems
+MOUNT_FSTYPES = ("vfat", "exfat", "ext4")
+
+_libc = ctypes.CDLL("libc.so.6", use_errno=True)
+_libc.mount.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p,
+                        ctypes.c_ulong, ctypes.c_void_p)
+_libc.umount2.argtypes = (ctypes.c_char_p, ctypes.c_int)
+
+# RSA-PSS salt length the provisioner signs with: "auto" (default, accepts
+# any salt length), "digest" (32 bytes) or an explicit byte count
+PSS_SALT_LEN = os.environ.get("PSS_SALT_LEN", "auto")
+
+
+def _pss_salt_length(setting):
+    """
+    Map a PSS_SALT_LEN setting to a salt_length for padding.PSS.
+    
+    Unknown values are reported on stderr and treated as "auto".
+    """
+    if setting == "auto":
+        return padding.PSS.AUTO
+    if setting == "digest":
+        return hashes.SHA256.digest_size
+    # isascii() as well: isdigit() accepts e.g. "²", which int() rejects
+    if setting.isascii() and setting.isdigit():
+        return int(setting)
+    sys.stderr.write(f"usb-flash-monitor: invalid PSS_SALT_LEN {setting!r}, using 'auto'\n")
+    return padding.PSS.AUTO
+
+
+# Parsed PSS_SALT_LEN; an explicit count is checked against the key in self_test()
+_PSS_SALT_LENGTH = _pss_salt_length(PSS_SALT_LEN)
+
+# Signature scheme used by the provisioner, shared by every verification
+_PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=_PSS_SALT_LENGTH
+)
+
+# Fixed salt appended to the serial before hashing; must match the provisioner
+_SALT_BYTES = b"manufacture"
+
+# Largest device.sig accepted (RSA-4096); Ed25519 is 64, DER ECDSA P-256 <= 72
+MAX_SIGNATURE_SIZE = 512
+
+# Optional provisioner-made signature over SELFTEST_SERIAL, checked at startup.
+# The example recipe doesn't ship one, so by default only the key load is
+# checked; install it from a bbappend to enable the signature check.
+SELFTEST_SIG_FILE = "/etc/usb-validator/selftest.sig"
+SELFTEST_SERIAL = "SELFTEST"
+
+# RSA and ECDSA get the SHA-256 of the signed message from hashlib
+_PREHASHED = utils.Prehashed(hashes.SHA256())
+
+# Encoded output line for each state, written straight to fd 1
+_OUT = {"0": b"0\n", "1": b"1\n", "3": b"3\n"}
+
+# /sys/block opened once so per-device lookups resolve relative to it
+_SYSBLOCK_FD = None
+
+# {block name: removable}; entries are dropped when the device goes away
+_REMOVABLE_CACHE = {}
+
+# Held by a validation worker, so a quick re-insert waits for the unmount
+_VALIDATE_LOCK = threading.Lock()
+
+# Parsed default public key, set by the first successful load_public_key()
+_PUBKEY = None
+
+
+def _sysblock_fd():
+    """Return an O_PATH fd for /sys/block, opened on first use."""
+    global _SYSBLOCK_FD
+    
+    if _SYSBLOCK_FD is None:
+        _SYSBLOCK_FD = os.open("/sys/block", os.O_PATH | os.O_DIRECTORY | os.O_CLOEXEC)
+    return _SYSBLOCK_FD
+
 
 def block_dev_is_removable(block_name):
     """Return True if /sys/block/<name> is removable."""
-    path = os.path.join("/sys/block", block_name, "removable")
+    removable = _REMOVABLE_CACHE.get(block_name)
+    if removable is not None:
+        return removable
+    
     try:
-        with open(path) as f:
-            return f.read().strip() == "1"
-    except (OSError, IOError):
+        fd = os.open(f"{block_name}/removable", os.O_RDONLY | os.O_CLOEXEC, dir_fd=_sysblock_fd())
+        try:
+            removable = os.read(fd, 2)[:1] == b"1"
+        finally:
+            os.close(fd)
+    except OSError:
         return False
+    
+    _REMOVABLE_CACHE[block_name] = removable
+    return removable
 
 
 def block_dev_usb_port(block_name):
@@ -39,20 +158,22 @@ def block_dev_usb_port(block_name):
     Return the USB port string (e.g. '1-1' or '1-1.2') for this block device,
     or None if not USB.
     """
-    device_link = os.path.join("/sys/block", block_name, "device")
+    # /sys/block/<name> links to ../devices/.../usb2/2-1/.../block/<name>,
+    # so one readlink gives the USB path without realpath's per-component lstat
     try:
-        target = os.path.realpath(device_link)
+        target = os.readlink(block_name, dir_fd=_sysblock_fd())
     except OSError:
         return None
+    return usb_port_from_path(target)
+
+
+def usb_port_from_path(path):
+    """
+    Return the USB port string contained in a sysfs device path, or None.
+    """
     # Path looks like .../usb1/1-1.2/1-1.2:1.0/... or .../usb2/2-1/...
-    parts = target.split(os.sep)
-    for i, part in enumerate(parts):
-        if part.startswith("usb") and i + 1 < len(parts):
-            port = parts[i + 1]
-            # Port is typically "1-1", "1-1.2", "2-1", etc.
-            if "-" in port and port[0].isdigit():
-                return port
-    return None
+    m = _USB_PORT_RE.search(path)
+    return m.group(1) if m else None
 
 
 def port_matches(device_port):
@@ -63,53 +184,73 @@ def port_matches(device_port):
     if device_port == USB_PORT:
         return True
     # Target is a parent port: e.g. USB_PORT=1-1, device_port=1-1.2
-    if device_port.startswith(USB_PORT + ".") or device_port.startswith(USB_PORT + ":"):
+    if device_port.startswith(_PORT_PREFIXES):
         return True
     return False
 
 
-def usb_flash_detected():
-    """Return True if a USB flash drive is present on the configured port."""
-    try:
-        names = os.listdir("/sys/block")
-    except OSError:
-        return False
-    for name in names:
-        if not name.startswith("sd"):
-            continue
-        if not block_dev_is_removable(name):
-            continue
-        port = block_dev_usb_port(name)
-        if port_matches(port):
-            return True
-    return False
+# Last /sys/block scan: monotonic time, sorted entry names, and
+# {name: (removable, port, partition)}. Reset 't' to force a rescan.
+_scan_cache = {"t": 0, "names": None, "data": None}
 
+# Seconds a scan stays valid while the /sys/block listing is unchanged
+SCAN_CACHE_TTL = 10
 
-def get_device_name():
-    """Get the device name (e.g., 'sda1') of the USB flash drive on the configured port."""
+
+def _scan():
+    """
+    Return {name: (removable, port, partition)} for the sd* block devices.
+    
+    The result is reused while /sys/block lists the same entries and is
+    younger than SCAN_CACHE_TTL; partition is only looked up for removable
+    devices on the configured port.
+    """
     try:
-        names = os.listdir("/sys/block")
+        with os.scandir("/sys/block") as it:
+            names = tuple(sorted(entry.name for entry in it if entry.name.startswith("sd")))
     except OSError:
-        return None
+        return {}
+    
+    now = time.monotonic()
+    if (_scan_cache["data"] is not None and names == _scan_cache["names"]
+            and now - _scan_cache["t"] < SCAN_CACHE_TTL):
+        return _scan_cache["data"]
     
+    # Names can be reused by a different disk once the old one is gone
+    for name in set(_REMOVABLE_CACHE).difference(names):
+        del _REMOVABLE_CACHE[name]
+    
+    data = {}
     for name in names:
-        if not name.startswith("sd"):
-            continue
-        if not block_dev_is_removable(name):
-            continue
-        port = block_dev_usb_port(name)
-        if port_matches(port):
+        removable = block_dev_is_removable(name)
+        port = block_dev_usb_port(name) if removable else None
+        partition = None
+        if removable and port_matches(port):
             # Check for partition (e.g., sda1)
-            partition_path = f"/sys/block/{name}"
             try:
-                partitions = os.listdir(partition_path)
-                for partition in partitions:
-                    if partition.startswith(name) and partition != name:
-                        return partition
+                for partition_name in os.listdir(f"/sys/block/{name}"):
+                    if partition_name.startswith(name) and partition_name != name:
+                        partition = partition_name
+                        break
             except OSError:
                 pass
+        data[name] = (removable, port, partition)
+    
+    _scan_cache.update(t=now, names=names, data=data)
+    return data
+
+
+def get_device_name():
+    """
+    Get the device name (e.g., 'sda1') of the USB flash drive on the configured port.
+    
+    Returns:
+        str: Partition or disk name, or None if no drive is detected
+    """
+    for name, (removable, port, partition) in _scan().items():
+        if removable and port_matches(port):
             # If no partition found, return the device name itself
-            return name
+            return partition or name
     return None
 
 
@@ -150,22 +291,22 @@ def get_usb_serial_linux(device_name):
                 if serial:
                     return clean_serial(serial)
         
-        # Alternative: read from udev
-        try:
-            result = subprocess.run(
-                ['udevadm', 'info', '--query=property', f'--name=/dev/{base_device}'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('ID_SERIAL_SHORT='):
-                        serial = line.split('=', 1)[1].strip()
+        # Otherwise walk up from the block device to its USB device node,
+        # the first ancestor with idVendor (as udev's usb_id does), and read
+        # serial only there: hubs and root hubs above it have their own
+        target = os.readlink(f"/sys/block/{base_device}")
+        device_dir = os.path.normpath(os.path.join("/sys/block", target))
+        while device_dir.startswith("/sys/devices/"):
+            if os.path.exists(os.path.join(device_dir, "idVendor")):
+                try:
+                    with open(os.path.join(device_dir, "serial"), 'r') as f:
+                        serial = f.read().strip()
                         if serial:
                             return clean_serial(serial)
-        except:
-            pass
+                except OSError:
+                    pass
+                return None
+            device_dir = os.path.dirname(device_dir)
         
         return None
         
@@ -181,10 +322,16 @@ def load_public_key(pem_data=None):
         pem_data: PEM bytes (uses embedded key if None)
     
     Returns:
-        RSA public key object
+        Public key object (Ed25519, ECDSA or RSA)
     """
+    global _PUBKEY
+    
     if pem_data is None:
-        pem_data = PUBLIC_KEY_PEM
+        # The default key never changes while running, parse it only once
+        if _PUBKEY is not None:
+            return _PUBKEY
+        _PUBKEY = load_public_key(PUBLIC_KEY_PEM)
+        return _PUBKEY
     
     # If key not embedded, try loading from file
     if b"REPLACE_THIS" in pem_data:
@@ -208,39 +355,37 @@ def load_public_key(pem_data=None):
         return None
 
 
-def verify_signature(serial, signature, public_key, salt_string="manufacture"):
+def verify_signature(serial, signature, public_key, salt=_SALT_BYTES):
     """
     Verify signature against serial number.
-    Combines serial with a salt string, hashes with SHA-256, then verifies.
+    Combines serial with a fixed salt, hashes with SHA-256, then verifies
+    the signature over that digest with Ed25519, ECDSA-SHA256 or RSA-PSS
+    depending on the key type.
     
     Args:
         serial: USB serial number string
         signature: Signature bytes
-        public_key: RSA public key
-        salt_string: Fixed string to combine with serial (default: "manufacture")
+        public_key: Ed25519, ECDSA or RSA public key
+        salt: Fixed bytes to combine with serial (default: b"manufacture")
     
     Returns:
         bool: True if valid, False otherwise
     """
     try:
-        # Combine serial with salt string
-        data_to_hash = f"{serial}{salt_string}"
-        
-        # Hash the combined data with SHA-256
-        digest = hashes.Hash(hashes.SHA256(), backend=default_backend())
-        digest.update(data_to_hash.encode('utf-8'))
-        hashed_data = digest.finalize()
+        # Hash the serial combined with the salt with SHA-256
+        hashed_data = hashlib.sha256(serial.encode('utf-8') + salt).digest()
         
         # Verify the signature against the hash
-        public_key.verify(
-            signature,
-            hashed_data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        if isinstance(public_key, Ed25519PublicKey):
+            # Ed25519 hashes internally, no padding or hash algorithm
+            public_key.verify(signature, hashed_data)
+        else:
+            # RSA/ECDSA sign SHA-256 of the hash itself; compute that here too
+            message_digest = hashlib.sha256(hashed_data).digest()
+            if isinstance(public_key, ec.EllipticCurvePublicKey):
+                public_key.verify(signature, message_digest, ec.ECDSA(_PREHASHED))
+            else:
+                public_key.verify(signature, message_digest, _PSS_PADDING, _PREHASHED)
         return True
     except InvalidSignature:
         return False
@@ -248,6 +393,61 @@ def verify_signature(serial, signature, public_key, salt_string="manufacture"):
         return False
 
 
+def read_signature(sig_file):
+    """
+    Read a signature file, refusing symlinks and anything oversized.
+    
+    Args:
+        sig_file: Path to the signature file
+    
+    Returns:
+        bytes: Signature, or None if missing, unreadable, empty or too large
+    """
+    try:
+        fd = os.open(sig_file, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+    except OSError:
+        return None
+    try:
+        signature = os.read(fd, MAX_SIGNATURE_SIZE + 1)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    if not signature or len(signature) > MAX_SIGNATURE_SIZE:
+        return None
+    return signature
+
+
+def self_test():
+    """
+    Check at startup that the public key loads and, if SELFTEST_SIG_FILE
+    is installed, that its signature over SELFTEST_SERIAL verifies.
+    Without that file only the key load is checked.
+    
+    Returns:
+        bool: True if validation can work, False otherwise
+    """
+    public_key = load_public_key()
+    if not public_key:
+        return False
+    
+    # A salt longer than the key allows would make every RSA verify fail
+    if isinstance(public_key, rsa.RSAPublicKey) and isinstance(_PSS_SALT_LENGTH, int):
+        max_salt = (public_key.key_size + 6) // 8 - hashes.SHA256.digest_size - 2
+        if _PSS_SALT_LENGTH > max_salt:
+            sys.stderr.write(f"usb-flash-monitor: PSS_SALT_LEN {_PSS_SALT_LENGTH} exceeds {max_salt} for this key\n")
+            return False
+    
+    if not os.path.lexists(SELFTEST_SIG_FILE):
+        return True
+    
+    signature = read_signature(SELFTEST_SIG_FILE)
+    if not signature:
+        return False
+    
+    return verify_signature(SELFTEST_SERIAL, signature, public_key)
+
+
 def validate_mounted_usb(mount_point, device_name):
     """
     Validate the USB drive by checking signature.
@@ -265,16 +465,9 @@ def validate_mounted_usb(mount_point, device_name):
         if not public_key:
             return False
         
-        # Check for signature file
-        sig_file = os.path.join(mount_point, "device.sig")
-        if not os.path.exists(sig_file):
-            return False
-        
         # Read signature
-        try:
-            with open(sig_file, 'rb') as f:
-                signature = f.read()
-        except Exception:
+        signature = read_signature(os.path.join(mount_point, "device.sig"))
+        if not signature:
             return False
         
         # Get USB serial number
@@ -289,9 +482,66 @@ def validate_mounted_usb(mount_point, device_name):
         return False
 
 
+def mount_fstypes():
+    """
+    Return the filesystem types to try when mounting a USB drive.
+    
+    Returns:
+        list: MOUNT_FSTYPES followed by the other block filesystems the
+        kernel knows about
+    """
+    fstypes = list(MOUNT_FSTYPES)
+    try:
+        with open("/proc/filesystems") as f:
+            for line in f:
+                if line.startswith("nodev"):
+                    continue
+                fstype = line.strip()
+                if fstype and fstype not in fstypes:
+                    fstypes.append(fstype)
+    except OSError:
+        pass
+    return fstypes
+
+
+def mount_readonly(device_path, mount_point):
+    """
+    Mount device_path read-only on mount_point with mount(2).
+    
+    Args:
+        device_path: Block device path (e.g., '/dev/sda1')
+        mount_point: Existing directory to mount on
+    
+    Raises:
+        OSError: If no filesystem type could mount the device
+    """
+    flags = MS_RDONLY | MS_NOSUID | MS_NODEV | MS_NOEXEC | MS_SILENT
+    err = errno.ENODEV
+    for fstype in mount_fstypes():
+        if _libc.mount(device_path.encode(), mount_point.encode(), fstype.encode(), flags, None) == 0:
+            return
+        err = ctypes.get_errno()
+        # EINVAL/ENODEV mean wrong or unknown filesystem type, try the next one
+        if err not in (errno.EINVAL, errno.ENODEV):
+            break
+    raise OSError(err, os.strerror(err), device_path)
+
+
+def unmount(mount_point):
+    """
+    Lazily unmount mount_point with umount2(2).
+    
+    Raises:
+        OSError: If the unmount fails
+    """
+    if _libc.umount2(mount_point.encode(), MNT_DETACH) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), mount_point)
+
+
 def mount_and_validate(device_name):
     """
-    Mount the USB drive to a temporary folder and validate it.
+    Mount the USB drive on MOUNT_POINT and validate it.
     
     Args:
         device_name: Device name (e.g., 'sda1')
@@ -299,77 +549,207 @@ def mount_and_validate(device_name):
     Returns:
         str: "1" if valid, "3" if invalid
     """
-    mount_point = None
     try:
-        # Create temporary mount point
-        mount_point = tempfile.mkdtemp(prefix="usb_validate_")
+        # A drive pulled during validation can leave a stale mount behind
+        if os.path.ismount(MOUNT_POINT):
+            unmount(MOUNT_POINT)
         
         # Mount the device
         device_path = f"/dev/{device_name}"
-        result = subprocess.run(
-            ['mount', '-o', 'ro', device_path, mount_point],
-            capture_output=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
+        try:
+            mount_readonly(device_path, MOUNT_POINT)
+        except OSError:
             return "3"
         
-        # Validate the USB
-        is_valid = validate_mounted_usb(mount_point, device_name)
-        
-        # Unmount
-        subprocess.run(['umount', mount_point], timeout=10)
-        
-        # Clean up temp directory
+        # Validate the USB, then unmount
         try:
-            os.rmdir(mount_point)
-        except:
-            pass
+            is_valid = validate_mounted_usb(MOUNT_POINT, device_name)
+        finally:
+            try:
+                unmount(MOUNT_POINT)
+            except OSError:
+                pass
         
         return "1" if is_valid else "3"
         
     except Exception:
-        # Clean up on error
-        if mount_point:
-            try:
-                subprocess.run(['umount', mount_point], timeout=5, capture_output=True)
-                os.rmdir(mount_point)
-            except:
-                pass
         return "3"
 
 
+def validate_in_background(device_name):
+    """
+    Run mount_and_validate() on a worker thread.
+    
+    Args:
+        device_name: Device name (e.g., 'sda1')
+    
+    Returns:
+        list: Empty until the worker finishes, then holds its "1"/"3" result
+    """
+    result = []
+    
+    def run():
+        with _VALIDATE_LOCK:
+            result.append(mount_and_validate(device_name))
+    
+    threading.Thread(target=run, name="usb-validate").start()
+    return result
+
+
+def open_hotplug_monitor():
+    """
+    Start a udev monitor for block device events.
+    
+    Returns:
+        pyudev.Monitor or None if hotplug events are unavailable
+    """
+    if pyudev is None:
+        sys.stderr.write("usb-flash-monitor: pyudev not installed, polling /sys/block\n")
+        return None
+    
+    try:
+        monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+        monitor.filter_by("block")
+        monitor.start()
+        return monitor
+    except Exception as e:
+        sys.stderr.write(f"usb-flash-monitor: udev monitor unavailable ({e}), polling /sys/block\n")
+        return None
+
+
+def wait_for_hotplug(monitor, timeout):
+    """
+    Wait up to timeout seconds for a block event on the configured port,
+    returning as soon as one arrives.
+    
+    Args:
+        monitor: Monitor from open_hotplug_monitor() (None means polling)
+        timeout: Seconds to wait
+    
+    Returns:
+        bool: True if the port state may have changed and needs a rescan
+    
+    Raises:
+        OSError: If receiving from the udev monitor fails
+    """
+    if monitor is None:
+        time.sleep(timeout)
+        return True
+    
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # None is either the timeout or a message that carried no device
+        device = monitor.poll(timeout=remaining)
+        if device is None:
+            continue
+        if device.action not in ("add", "remove", "change"):
+            continue
+        if device.action == "remove":
+            _REMOVABLE_CACHE.pop(device.sys_name, None)
+        # Use the event's sysfs path: ancestors can't be walked on remove
+        # The kernel announces a disk only after scanning its partitions,
+        # so a rescan right away already sees sdX1
+        if port_matches(usb_port_from_path(device.sys_path)):
+            _scan_cache["t"] = 0
+            return True
+
+
+def raise_priority():
+    """Lower the process nice value to USB_MON_NICE if permitted."""
+    try:
+        nice = int(USB_MON_NICE)
+        if nice < os.getpriority(os.PRIO_PROCESS, 0):
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+    except (ValueError, OSError):
+        pass
+
+
+def exit_on_signal(signum, frame):
+    """Turn SIGTERM into SystemExit so the worker finishes and unmounts."""
+    sys.exit(0)
+
+
 def main():
     last_detected = False
     validation_result = None
+    device_name = None
+    rescan = True
+    
+    # Validation can take seconds; run it on a worker so output stays 1/sec
+    pending = None
+    
+    try:
+        os.makedirs(MOUNT_POINT, exist_ok=True)
+    except OSError:
+        pass
     
+    # Fail fast instead of reporting 3 for every drive with a broken key
+    if not self_test():
+        sys.stderr.write("usb-flash-monitor: public key missing or self-test signature invalid\n")
+        sys.exit(1)
+    
+    raise_priority()
+    signal.signal(signal.SIGTERM, exit_on_signal)
+    
+    # Only rescan /sys/block when udev reports a change on our port
+    monitor = open_hotplug_monitor()
+    
+    next_tick = time.monotonic()
     while True:
         try:
-            device_name = get_device_name()
+            if rescan:
+                device_name = get_device_name()
+                rescan = False
             currently_detected = device_name is not None
             
             if currently_detected:
                 # USB is detected on the correct port
                 if not last_detected:
-                    # Newly detected - mount and validate
-                    validation_result = mount_and_validate(device_name)
+                    # Newly detected - mount and validate in the background
+                    validation_result = None
+                    pending = validate_in_background(device_name)
                 
-                # Print validation result
-                print(validation_result, flush=True)
+                # The worker fills in its result slot once it has finished
+                if pending:
+                    validation_result = pending[0]
+                    pending = None
             else:
-                # No USB detected
-                print("0", flush=True)
+                # No USB detected; a late result would be for the removed drive
                 validation_result = None
+                pending = None
             
             last_detected = currently_detected
             
         except Exception:
-            print("0", flush=True)
             validation_result = None
+            pending = None
             last_detected = False
+            device_name = None
+            rescan = True
         
-        time.sleep(1)
+        # Output stays on a fixed 1/sec schedule; hotplug events only
+        # wake the loop early to rescan and start validation
+        now = time.monotonic()
+        if now >= next_tick:
+            # Print validation result: 0 without a drive or until validated
+            os.write(1, _OUT[validation_result or "0"])
+            next_tick += 1
+            if next_tick <= now:
+                # Fell behind (e.g. suspend): resync instead of printing a burst
+                next_tick = now + 1
+        
+        try:
+            if wait_for_hotplug(monitor, max(0, next_tick - time.monotonic())):
+                rescan = True
+        except OSError as e:
+            # udev monitor broke: poll /sys/block from now on
+            sys.stderr.write(f"usb-flash-monitor: udev monitor failed ({e}), polling /sys/block\n")
+            monitor = None
+            rescan = True
+            time.sleep(max(0, next_tick - time.monotonic()))
 
 
 if __name__ == "__main__":